@@ -2,10 +2,14 @@
 # Main script for the Ellesmere Port Snooker League Discord Bot
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import sqlite3
 import random
 import asyncio
+import threading
+import math
+import bisect
+import heapq
 from dotenv import load_dotenv
 import os
 from datetime import datetime
@@ -19,6 +23,26 @@ intents.message_content = True
 bot = commands.Bot(command_prefix='!', intents=intents)
 DB_FILE = 'league_database.sqlite'
 
+# --- BACKUP SETTINGS ---
+BACKUP_DIR = os.getenv("BACKUP_DIR", "backups")
+BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "14")) # Number of rotating snapshots to keep
+if BACKUP_KEEP < 1:
+    raise ValueError("BACKUP_KEEP must be at least 1, otherwise every backup would be deleted as soon as it is taken.")
+BACKUP_INTERVAL_HOURS = float(os.getenv("BACKUP_INTERVAL_HOURS", "24")) # 0 disables scheduled backups
+if BACKUP_INTERVAL_HOURS < 0:
+    raise ValueError("BACKUP_INTERVAL_HOURS must be 0 (disabled) or more.")
+BACKUP_PAGES_PER_STEP = 128 # Pages copied per step before the backup yields to other writers
+BACKUP_PREFIX = 'league_database-'
+RESTORE_PREFIX = 'pre_restore-'
+backup_lock = threading.Lock() # Only one backup or restore may run at a time
+
+# --- SWISS SETTINGS ---
+SWISS_SEARCH_LIMIT = 20000 # Max pairing attempts before a round falls back to allowing rematches
+
+# --- NAME LOOKUP SETTINGS ---
+FUZZY_MIN_SCORE = 0.3 # Minimum trigram similarity (0-1) for a name to be suggested
+FUZZY_MAX_CANDIDATES = 100 # Max names scored per fuzzy search, so common fragments like "cup" stay fast
+
 # --- DATABASE HELPER FUNCTIONS ---
 
 def db_connect():
@@ -69,7 +93,7 @@ def setup_database():
         CREATE TABLE IF NOT EXISTS competitions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT UNIQUE NOT NULL,
-            type TEXT NOT NULL, -- "league" or "cup"
+            type TEXT NOT NULL, -- "league", "cup" or "swiss"
             affects_handicap BOOLEAN NOT NULL,
             fixtures_channel_id INTEGER,
             results_channel_id INTEGER
@@ -107,7 +131,7 @@ def setup_database():
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             competition_id INTEGER NOT NULL,
             week INTEGER, -- For leagues
-            round INTEGER, -- For cups
+            round INTEGER, -- For cups and swiss events
             participant1_id INTEGER NOT NULL,
             participant2_id INTEGER, -- Can be NULL for a bye
             is_complete BOOLEAN DEFAULT 0,
@@ -119,6 +143,431 @@ def setup_database():
     conn.close()
     print("Database setup complete.")
 
+# --- BACKUP HELPER FUNCTIONS ---
+# These run in a worker thread (see run_in_thread) so a backup never blocks command handling.
+
+def _snapshot_path(prefix):
+    """Builds a unique, timestamped snapshot path inside the backup directory."""
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    # Microseconds keep names in creation order, even when an older snapshot from the same second was pruned.
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    path = os.path.join(BACKUP_DIR, f"{prefix}{stamp}.sqlite")
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(BACKUP_DIR, f"{prefix}{stamp}-{counter}.sqlite")
+        counter += 1
+    return path
+
+def _copy_database(source_path, target_path, pages):
+    """Copies one SQLite database into another using the online backup API."""
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        # Copying in small steps releases the source lock between steps, so the bot can keep writing.
+        source.backup(target, pages=pages, sleep=0.01)
+    finally:
+        target.close()
+        source.close()
+
+def backup_stats():
+    """Returns (file name, os.stat_result) for each snapshot in the backup directory, newest first."""
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    stats = []
+    with os.scandir(BACKUP_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.sqlite'):
+                continue
+            try:
+                stats.append((entry.name, entry.stat()))
+            except FileNotFoundError:
+                # Pruned by a backup running in another thread since the directory was listed.
+                continue
+    return sorted(stats, key=lambda s: s[1].st_mtime, reverse=True)
+
+def list_backups():
+    """Returns the snapshot file names in the backup directory, newest first."""
+    return [name for name, _ in backup_stats()]
+
+def prune_backups():
+    """Deletes the oldest rotating snapshots so that only BACKUP_KEEP remain."""
+    rotating = [f for f in list_backups() if f.startswith(BACKUP_PREFIX)]
+    for name in rotating[BACKUP_KEEP:]:
+        os.remove(os.path.join(BACKUP_DIR, name))
+
+def _take_snapshot(prefix, pages):
+    """Copies the live database to a new snapshot file. The caller must hold backup_lock."""
+    path = _snapshot_path(prefix)
+    partial_path = path + '.part'
+    try:
+        _copy_database(DB_FILE, partial_path, pages)
+        # Only a finished copy gets the .sqlite name, so a crash never leaves a broken snapshot behind.
+        os.replace(partial_path, path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    return path
+
+def create_backup():
+    """Takes a point-in-time snapshot of the live database and returns its path."""
+    with backup_lock:
+        path = _take_snapshot(BACKUP_PREFIX, BACKUP_PAGES_PER_STEP)
+        prune_backups()
+    return path
+
+def _check_snapshot(snapshot_name):
+    """Raises unless the snapshot exists, passes an integrity check and actually contains tables."""
+    if snapshot_name not in list_backups():
+        raise FileNotFoundError(f"Snapshot '{snapshot_name}' not found.")
+    snapshot_path = os.path.join(BACKUP_DIR, snapshot_name)
+
+    # Read-only, so a snapshot deleted in the meantime raises instead of being recreated as an empty file.
+    check = sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)
+    try:
+        result = check.execute("PRAGMA quick_check").fetchone()[0]
+        # An empty file passes quick_check, so make sure there is a schema to restore.
+        tables = check.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]
+    finally:
+        check.close()
+    if result != 'ok':
+        raise sqlite3.DatabaseError(f"Snapshot '{snapshot_name}' failed its integrity check: {result}")
+    if not tables:
+        raise sqlite3.DatabaseError(f"Snapshot '{snapshot_name}' is empty.")
+    return snapshot_path
+
+def restore_backup(snapshot_name):
+    """Overwrites the live database with a snapshot. Returns the path of the safety snapshot taken first."""
+    # Checking, the safety snapshot and the overwrite all happen under one lock hold, so no backup can
+    # prune the snapshot or run in between. Both copies are single steps, so the overwrite starts as soon
+    # as the safety snapshot is done.
+    with backup_lock:
+        snapshot_path = _check_snapshot(snapshot_name)
+        # Keep the current state in case the restore was a mistake. These are not rotated away.
+        safety_path = _take_snapshot(RESTORE_PREFIX, -1)
+        _copy_database(snapshot_path, DB_FILE, -1)
+    return safety_path
+
+async def run_in_thread(func, *args):
+    """Runs a blocking function in the default executor and waits for its result."""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+@tasks.loop(hours=BACKUP_INTERVAL_HOURS or 24)
+async def scheduled_backup():
+    """Background job that takes a rotating snapshot every BACKUP_INTERVAL_HOURS."""
+    try:
+        path = await run_in_thread(create_backup)
+        print(f"Scheduled backup saved to {path}.")
+    except (sqlite3.Error, OSError) as e:
+        print(f"Scheduled backup failed: {e}")
+
+@scheduled_backup.before_loop
+async def wait_for_backup_due():
+    """Delays the first scheduled backup until the newest one is BACKUP_INTERVAL_HOURS old.
+    Without this, every restart would take a snapshot, and a crash loop would rotate away the older history."""
+    rotating = [(name, st) for name, st in backup_stats() if name.startswith(BACKUP_PREFIX)]
+    if rotating:
+        age = datetime.now().timestamp() - rotating[0][1].st_mtime
+        remaining = BACKUP_INTERVAL_HOURS * 3600 - age
+        if remaining > 0:
+            print(f"Last backup is recent; next scheduled backup in {remaining / 3600:.1f} hours.")
+            await asyncio.sleep(remaining)
+
+# --- SWISS PAIRING HELPERS ---
+
+def swiss_round_count(num_players):
+    """Number of rounds needed to find a clear winner: ceil(log2(n)), capped so nobody has to meet twice."""
+    if num_players < 2:
+        return 0
+    return min(math.ceil(math.log2(num_players)), num_players - 1)
+
+def load_swiss_state(cursor, comp_id):
+    """Loads players, points, previous opponents and bye history for a Swiss competition."""
+    cursor.execute("""
+        SELECT p.id, p.name FROM competition_participants cp
+        JOIN players p ON cp.participant_id = p.id
+        WHERE cp.competition_id = ? AND cp.participant_type = 'player'
+    """, (comp_id,))
+    players = [dict(row) for row in cursor.fetchall()]
+    points = {p['id']: 0 for p in players}
+    opponents = {p['id']: set() for p in players}
+    had_bye = set()
+
+    # A win or a bye is worth one point.
+    cursor.execute("SELECT winner_id, loser_id FROM match_history WHERE competition_id = ?", (comp_id,))
+    for winner_id, loser_id in cursor.fetchall():
+        if winner_id in points:
+            points[winner_id] += 1
+        if winner_id in opponents and loser_id in opponents:
+            opponents[winner_id].add(loser_id)
+            opponents[loser_id].add(winner_id)
+
+    cursor.execute("SELECT participant1_id, participant2_id FROM fixtures WHERE competition_id = ?", (comp_id,))
+    for p1_id, p2_id in cursor.fetchall():
+        if p1_id not in points:
+            continue
+        if p2_id is None:
+            had_bye.add(p1_id)
+            points[p1_id] += 1
+        elif p2_id in opponents:
+            opponents[p1_id].add(p2_id)
+            opponents[p2_id].add(p1_id)
+
+    return players, points, opponents, had_bye
+
+def _pair_without_rematches(players, opponents):
+    """Pairs players in order, each with the nearest-ranked player they haven't met.
+    Backtracks when the tail of the list can't be paired, and gives up (returns None) after SWISS_SEARCH_LIMIT attempts."""
+    budget = [SWISS_SEARCH_LIMIT]
+
+    def search(remaining):
+        if not remaining:
+            return []
+        first = remaining[0]
+        for i in range(1, len(remaining)):
+            budget[0] -= 1
+            if budget[0] < 0:
+                return None
+            opponent = remaining[i]
+            if opponent['id'] in opponents[first['id']]:
+                continue
+            rest = search(remaining[1:i] + remaining[i + 1:])
+            if rest is not None:
+                return [(first, opponent)] + rest
+        return None
+
+    return search(players)
+
+def pair_swiss_round(players, points, opponents, had_bye):
+    """Pairs one Swiss round. Returns a list of (player1, player2) pairs and the player receiving a bye (or None)."""
+    players = list(players)
+    random.shuffle(players) # Random order within each points group
+    players.sort(key=lambda p: points[p['id']], reverse=True)
+
+    bye_player = None
+    if len(players) % 2 != 0:
+        # The lowest-ranked player who hasn't had a bye yet sits this round out.
+        bye_player = next((p for p in reversed(players) if p['id'] not in had_bye), players[-1])
+        players.remove(bye_player)
+
+    pairs = _pair_without_rematches(players, opponents)
+    if pairs is None:
+        # No rematch-free pairing was found in time, so pair neighbours in the standings instead.
+        pairs = [(players[i], players[i + 1]) for i in range(0, len(players), 2)]
+    return pairs, bye_player
+
+def generate_swiss_round(cursor, comp_id, round_num):
+    """Pairs the next Swiss round from the current standings and saves it as fixtures."""
+    players, points, opponents, had_bye = load_swiss_state(cursor, comp_id)
+    pairs, bye_player = pair_swiss_round(players, points, opponents, had_bye)
+
+    if bye_player:
+        cursor.execute("INSERT INTO fixtures (competition_id, round, participant1_id, is_complete) VALUES (?, ?, ?, 1)",
+                       (comp_id, round_num, bye_player['id']))
+    cursor.executemany("INSERT INTO fixtures (competition_id, round, participant1_id, participant2_id) VALUES (?, ?, ?, ?)",
+                       [(comp_id, round_num, p1['id'], p2['id']) for p1, p2 in pairs])
+    return pairs, bye_player
+
+def swiss_progress(cursor, comp_id):
+    """Returns (current round, incomplete fixtures in that round, total rounds) for a Swiss competition."""
+    cursor.execute("SELECT MAX(round) FROM fixtures WHERE competition_id = ?", (comp_id,))
+    current_round = cursor.fetchone()[0] or 0
+    cursor.execute("SELECT COUNT(*) FROM fixtures WHERE competition_id = ? AND round = ? AND is_complete = 0",
+                   (comp_id, current_round))
+    open_fixtures = cursor.fetchone()[0]
+    cursor.execute("SELECT COUNT(*) FROM competition_participants WHERE competition_id = ? AND participant_type = 'player'",
+                   (comp_id,))
+    return current_round, open_fixtures, swiss_round_count(cursor.fetchone()[0])
+
+def swiss_standings(cursor, comp_id):
+    """Returns players ranked by points, then Buchholz (the total points of everyone they have played)."""
+    players, points, opponents, _ = load_swiss_state(cursor, comp_id)
+    for p in players:
+        p['points'] = points[p['id']]
+        p['buchholz'] = sum(points[o] for o in opponents[p['id']])
+    return sorted(players, key=lambda p: (p['points'], p['buchholz']), reverse=True)
+
+def swiss_round_embeds(comp_name, round_num, pairs, bye_player):
+    """Builds the announcement for a Swiss round, split to stay within Discord's embed size limits."""
+    lines = [f"**{p1['name']}** vs **{p2['name']}**" for p1, p2 in pairs]
+    if bye_player:
+        lines.append(f"{bye_player['name']} gets a bye this round.")
+
+    embeds = []
+    embed = discord.Embed(title=f"🗓️ {comp_name} - Round {round_num}", color=discord.Color.blue())
+    chunk = ""
+    for line in lines:
+        if len(chunk) + len(line) + 1 > 1024:
+            embed.add_field(name="Matches", value=chunk.strip(), inline=False)
+            chunk = ""
+            # Start a new embed well before the 25 field / 6000 character limits.
+            if len(embed.fields) >= 5:
+                embeds.append(embed)
+                embed = discord.Embed(title=f"🗓️ {comp_name} - Round {round_num} (cont.)", color=discord.Color.blue())
+        chunk += line + "\n"
+    if chunk:
+        embed.add_field(name="Matches", value=chunk.strip(), inline=False)
+    embeds.append(embed)
+    return embeds
+
+def swiss_standings_embed(comp_name, standings):
+    """Builds the final standings table for a Swiss competition."""
+    lines = [f"**{i}.** {p['name']} - {p['points']} pts (Buchholz {p['buchholz']})"
+             for i, p in enumerate(standings[:20], start=1)]
+    return discord.Embed(title=f"🏁 Final Standings for {comp_name}", description='\n'.join(lines), color=discord.Color.gold())
+
+# --- NAME LOOKUP INDEX ---
+
+def _trigrams(text):
+    """Splits lowercase text into overlapping three-character chunks. Each word is padded separately,
+    so a single misspelt word still scores well against a longer name."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class NameIndex:
+    """In-memory index of one kind of name (teams, players or competitions).
+    Supports case-insensitive, prefix and fuzzy (trigram) lookups in under a millisecond."""
+
+    def __init__(self):
+        self.names = {} # id -> stored name
+        self.by_lower = {} # lowercase name -> ids with that name
+        self.sorted_lower = [] # sorted lowercase names, for prefix search
+        self.trigrams = {} # trigram -> ids containing it
+        self.grams = {} # id -> trigrams in its name
+
+    def clear(self):
+        self.__init__()
+
+    def add(self, item_id, name):
+        if item_id in self.names:
+            self.remove(item_id)
+        lower = name.lower()
+        self.names[item_id] = name
+        if lower not in self.by_lower:
+            self.by_lower[lower] = set()
+            bisect.insort(self.sorted_lower, lower)
+        self.by_lower[lower].add(item_id)
+        grams = frozenset(_trigrams(lower))
+        self.grams[item_id] = grams
+        for gram in grams:
+            self.trigrams.setdefault(gram, set()).add(item_id)
+
+    def remove(self, item_id):
+        name = self.names.pop(item_id, None)
+        if name is None:
+            return
+        lower = name.lower()
+        ids = self.by_lower[lower]
+        ids.discard(item_id)
+        if not ids:
+            del self.by_lower[lower]
+            del self.sorted_lower[bisect.bisect_left(self.sorted_lower, lower)]
+        for gram in self.grams.pop(item_id):
+            postings = self.trigrams[gram]
+            postings.discard(item_id)
+            if not postings:
+                del self.trigrams[gram]
+
+    def _names_for(self, lower):
+        return sorted({self.names[i] for i in self.by_lower[lower]})
+
+    def _prefixed(self, lower, limit):
+        """Returns up to `limit` lowercase names starting with `lower`, in alphabetical order.
+        An exact match always comes first, because it sorts before every longer name starting with it."""
+        start = bisect.bisect_left(self.sorted_lower, lower)
+        matches = []
+        for candidate in self.sorted_lower[start:start + limit]:
+            if not candidate.startswith(lower):
+                break
+            matches.append(candidate)
+        return matches
+
+    def resolve(self, query, allow_prefix=True):
+        """Returns the stored name for an exact or case-insensitive match, or None.
+        With allow_prefix, a prefix that matches exactly one name is completed too."""
+        lower = query.lower()
+        if lower in self.by_lower:
+            names = self._names_for(lower)
+            if query in names:
+                return query
+            return names[0] if len(names) == 1 else None
+        if not allow_prefix:
+            return None
+        prefixed = self._prefixed(lower, 2)
+        if len(prefixed) == 1:
+            names = self._names_for(prefixed[0])
+            if len(names) == 1:
+                return names[0]
+        return None
+
+    def search(self, query, limit=5):
+        """Returns up to `limit` names: prefix matches (exact first, then alphabetical), then the closest fuzzy matches."""
+        lower = query.lower()
+        results = []
+        for candidate in self._prefixed(lower, limit):
+            results.extend(n for n in self._names_for(candidate) if n not in results)
+
+        if len(results) < limit:
+            # Gather candidates from the query's rarest trigrams first. Those are the most telling, and stopping at
+            # FUZZY_MAX_CANDIDATES avoids walking the huge posting lists of common trigrams like "cup" or "the".
+            query_grams = _trigrams(lower)
+            shared = {} # candidate id -> trigrams shared with the query
+            for gram in sorted(query_grams, key=lambda g: len(self.trigrams.get(g, ()))):
+                postings = self.trigrams.get(gram, ())
+                # Count this trigram for the names already found, walking whichever of the two sets is smaller.
+                if len(postings) < len(shared):
+                    for item_id in postings:
+                        if item_id in shared:
+                            shared[item_id] += 1
+                else:
+                    for item_id in shared:
+                        if item_id in postings:
+                            shared[item_id] += 1
+                # Then take new names from it until the candidate list is full.
+                room = FUZZY_MAX_CANDIDATES - len(shared)
+                for item_id in postings:
+                    if room <= 0:
+                        break
+                    if item_id not in shared:
+                        shared[item_id] = 1
+                        room -= 1
+            # Dice similarity between the query and each candidate.
+            scored = ((2 * count / (len(query_grams) + len(self.grams[item_id])), self.names[item_id])
+                      for item_id, count in shared.items())
+            for score, name in heapq.nlargest(limit * 2, scored):
+                if score < FUZZY_MIN_SCORE or len(results) >= limit:
+                    break
+                if name not in results:
+                    results.append(name)
+        return results[:limit]
+
+name_indexes = {'team': NameIndex(), 'player': NameIndex(), 'competition': NameIndex()}
+
+def rebuild_name_indexes():
+    """Reloads every name index from the database."""
+    conn = db_connect()
+    for kind, table in (('team', 'teams'), ('player', 'players'), ('competition', 'competitions')):
+        index = name_indexes[kind]
+        index.clear()
+        for row in conn.cursor().execute(f"SELECT id, name FROM {table}"):
+            index.add(row['id'], row['name'])
+    conn.close()
+
+def resolve_name(kind, name, allow_prefix=True):
+    """Maps a typed name onto the stored one, ignoring case or completing a unique prefix.
+    Destructive or ambiguous callers pass allow_prefix=False and rely on did_you_mean instead.
+    Returns the input unchanged if nothing matches, so the caller's own lookup reports it as not found."""
+    return name_indexes[kind].resolve(name, allow_prefix) or name
+
+def did_you_mean(kind, name):
+    """Builds a ' Did you mean ...?' hint for a name that wasn't found, or an empty string."""
+    suggestions = name_indexes[kind].search(name, limit=3)
+    if not suggestions:
+        return ""
+    return " Did you mean " + ", ".join(f"'{s}'" for s in suggestions) + "?"
+
 # --- BOT EVENTS ---
 
 @bot.event
@@ -126,6 +575,10 @@ async def on_ready():
     """Event that runs when the bot has successfully connected to Discord."""
     print(f'{bot.user.name} has connected to Discord!')
     setup_database()
+    rebuild_name_indexes()
+    # on_ready can fire again after a reconnect, so only start the backup job once.
+    if BACKUP_INTERVAL_HOURS > 0 and not scheduled_backup.is_running():
+        scheduled_backup.start()
 
 # --- ADMIN: MASTER LIST MANAGEMENT ---
 
@@ -134,8 +587,10 @@ async def on_ready():
 async def add_team(ctx, team_name: str):
     conn = db_connect()
     try:
-        conn.cursor().execute("INSERT INTO teams (name) VALUES (?)", (team_name,))
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO teams (name) VALUES (?)", (team_name,))
         conn.commit()
+        name_indexes['team'].add(cursor.lastrowid, team_name)
         await ctx.send(f"✅ Team '{team_name}' has been added to the master list.")
     except sqlite3.IntegrityError:
         await ctx.send(f"⚠️ Error: A team with the name '{team_name}' already exists.")
@@ -145,13 +600,14 @@ async def add_team(ctx, team_name: str):
 @bot.command(name='del_team', help='Deletes a team from the master list. Usage: !del_team "Team Name"')
 @commands.has_role('Admin')
 async def del_team(ctx, team_name: str):
+    team_name = resolve_name('team', team_name, allow_prefix=False)
     conn = db_connect()
     cursor = conn.cursor()
     try:
         cursor.execute("SELECT id FROM teams WHERE name = ?", (team_name,))
         team = cursor.fetchone()
         if not team:
-            await ctx.send(f"⚠️ Error: Team '{team_name}' not found.")
+            await ctx.send(f"⚠️ Error: Team '{team_name}' not found.{did_you_mean('team', team_name)}")
             return
 
         team_id = team['id']
@@ -163,6 +619,7 @@ async def del_team(ctx, team_name: str):
         cursor.execute("DELETE FROM teams WHERE id = ?", (team_id,))
         
         conn.commit()
+        name_indexes['team'].remove(team_id)
         await ctx.send(f"✅ Team '{team_name}' has been deleted. Players on this team are now free agents.")
     except sqlite3.Error as e:
         conn.rollback()
@@ -178,10 +635,11 @@ async def add_player(ctx, member: discord.Member, starting_handicap: int, *, tea
     
     team_id = None
     if team_name:
+        team_name = resolve_name('team', team_name)
         cursor.execute("SELECT id FROM teams WHERE name = ?", (team_name,))
         team = cursor.fetchone()
         if not team:
-            await ctx.send(f"⚠️ Warning: Team '{team_name}' not found. Player will be added without a team.")
+            await ctx.send(f"⚠️ Warning: Team '{team_name}' not found. Player will be added without a team.{did_you_mean('team', team_name)}")
         else:
             team_id = team['id']
             
@@ -189,6 +647,7 @@ async def add_player(ctx, member: discord.Member, starting_handicap: int, *, tea
         cursor.execute("INSERT INTO players (id, name, handicap, team_id) VALUES (?, ?, ?, ?)", 
                        (member.id, member.display_name, starting_handicap, team_id))
         conn.commit()
+        name_indexes['player'].add(member.id, member.display_name)
         
         response = f"✅ Player '{member.display_name}' registered with handicap {starting_handicap}."
         if team_id:
@@ -218,6 +677,7 @@ async def del_player(ctx, member: discord.Member):
         cursor.execute("DELETE FROM players WHERE id = ?", (member.id,))
         
         conn.commit()
+        name_indexes['player'].remove(member.id)
         await ctx.send(f"✅ Player '{member.display_name}' has been deleted from the master list and all competitions.")
     except sqlite3.IntegrityError:
         conn.rollback()
@@ -234,13 +694,14 @@ async def assign_team(ctx, team_name: str, *members: discord.Member):
     if not members:
         return await ctx.send("⚠️ You must specify at least one player to assign.")
 
+    team_name = resolve_name('team', team_name)
     conn = db_connect()
     cursor = conn.cursor()
 
     cursor.execute("SELECT id FROM teams WHERE name = ?", (team_name,))
     team = cursor.fetchone()
     if not team:
-        await ctx.send(f"⚠️ Error: Team '{team_name}' not found.")
+        await ctx.send(f"⚠️ Error: Team '{team_name}' not found.{did_you_mean('team', team_name)}")
         conn.close()
         return
 
@@ -272,16 +733,18 @@ async def assign_team(ctx, team_name: str, *members: discord.Member):
 @commands.has_role('Admin')
 async def create_comp(ctx, name: str, comp_type: str, affects_handicap: str):
     comp_type = comp_type.lower()
-    if comp_type not in ['league', 'cup']:
-        return await ctx.send("⚠️ Invalid type. Must be `league` or `cup`.")
+    if comp_type not in ['league', 'cup', 'swiss']:
+        return await ctx.send("⚠️ Invalid type. Must be `league`, `cup` or `swiss`.")
     
     handicap_bool = affects_handicap.lower() in ['yes', 'true', 'y', '1']
     
     conn = db_connect()
     try:
-        conn.cursor().execute("INSERT INTO competitions (name, type, affects_handicap) VALUES (?, ?, ?)",
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO competitions (name, type, affects_handicap) VALUES (?, ?, ?)",
                        (name, comp_type, handicap_bool))
         conn.commit()
+        name_indexes['competition'].add(cursor.lastrowid, name)
         await ctx.send(f"🏆 Competition '{name}' created! Type: `{comp_type}`, Affects Handicaps: `{handicap_bool}`.")
     except sqlite3.IntegrityError:
         await ctx.send(f"⚠️ Error: A competition with the name '{name}' already exists.")
@@ -296,6 +759,7 @@ async def comp_channel(ctx, name: str, channel_type: str, channel: discord.TextC
         return await ctx.send("⚠️ Invalid channel type. Must be `fixtures` or `results`.")
     
     column = f"{channel_type}_channel_id"
+    name = resolve_name('competition', name)
     conn = db_connect()
     cursor = conn.cursor()
     cursor.execute(f"UPDATE competitions SET {column} = ? WHERE name = ?", (channel.id, name))
@@ -303,7 +767,7 @@ async def comp_channel(ctx, name: str, channel_type: str, channel: discord.TextC
         conn.commit()
         await ctx.send(f"✅ The `{channel_type}` channel for '{name}' has been set to {channel.mention}.")
     else:
-        await ctx.send(f"⚠️ Error: Competition '{name}' not found.")
+        await ctx.send(f"⚠️ Error: Competition '{name}' not found.{did_you_mean('competition', name)}")
     conn.close()
 
 @bot.command(name='add_participant', help='Adds one or more participants to a competition. Usage: !add_participant "Comp Name" @player1 "Team Name" @player2 ...')
@@ -312,13 +776,14 @@ async def add_participant(ctx, comp_name: str, *participants: str):
     if not participants:
         return await ctx.send("⚠️ You must specify at least one participant to add.")
 
+    comp_name = resolve_name('competition', comp_name)
     conn = db_connect()
     cursor = conn.cursor()
     
     cursor.execute("SELECT id FROM competitions WHERE name = ?", (comp_name,))
     comp = cursor.fetchone()
     if not comp:
-        await ctx.send(f"⚠️ Competition '{comp_name}' not found.")
+        await ctx.send(f"⚠️ Competition '{comp_name}' not found.{did_you_mean('competition', comp_name)}")
         conn.close()
         return
     
@@ -340,14 +805,14 @@ async def add_participant(ctx, comp_name: str, *participants: str):
             participant_name = member.display_name
         except commands.MemberNotFound:
             # Fallback to team name
-            cursor.execute("SELECT id, name FROM teams WHERE name = ?", (p_str,))
+            cursor.execute("SELECT id, name FROM teams WHERE name = ?", (resolve_name('team', p_str, allow_prefix=False),))
             team = cursor.fetchone()
             if team:
                 participant_id = team['id']
                 participant_type = 'team'
                 participant_name = team['name']
             else:
-                failed.append(f"'{p_str}'")
+                failed.append(f"'{p_str}'{did_you_mean('team', p_str)}")
                 continue
         
         if participant_id:
@@ -394,13 +859,21 @@ async def list_comps(ctx):
 @bot.command(name='generate_fixtures', help='Generates fixtures for a competition. Usage: !generate_fixtures "Comp Name"')
 @commands.has_role('Admin')
 async def generate_fixtures(ctx, comp_name: str):
+    comp_name = resolve_name('competition', comp_name)
     conn = db_connect()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM competitions WHERE name = ?", (comp_name,))
     comp = cursor.fetchone()
     if not comp:
         conn.close()
-        return await ctx.send(f"⚠️ Competition '{comp_name}' not found.")
+        return await ctx.send(f"⚠️ Competition '{comp_name}' not found.{did_you_mean('competition', comp_name)}")
+
+    # Swiss points and rematch checks come from the competition's results, so a restarted draw would be seeded from stale data.
+    if comp['type'] == 'swiss':
+        cursor.execute("SELECT 1 FROM match_history WHERE competition_id = ? LIMIT 1", (comp['id'],))
+        if cursor.fetchone():
+            conn.close()
+            return await ctx.send(f"⚠️ Results have already been reported in '{comp_name}', so its swiss draw can't be restarted. Create a new competition instead.")
 
     # Check for existing fixtures and ask for confirmation to overwrite
     cursor.execute("SELECT id FROM fixtures WHERE competition_id = ?", (comp['id'],))
@@ -436,6 +909,7 @@ async def generate_fixtures(ctx, comp_name: str):
         return await ctx.send(f"⚠️ Could not find the fixtures channel. Maybe I don't have permission to see it?")
 
     embed = discord.Embed(title=f"🗓️ Fixtures for {comp_name}", color=discord.Color.blue())
+    embeds = [embed]
 
     # --- LEAGUE LOGIC ---
     if comp['type'] == 'league':
@@ -512,13 +986,81 @@ async def generate_fixtures(ctx, comp_name: str):
             cup_str += f"**{p1['name']}** vs **{p2['name']}**\n"
         embed.add_field(name=f"Round {round_num} Matches", value=cup_str.strip(), inline=False)
 
+    # --- SWISS LOGIC ---
+    # Only round 1 is generated here. Each later round is paired by !report once the previous round is complete.
+    elif comp['type'] == 'swiss':
+        cursor.execute("SELECT COUNT(*) FROM competition_participants WHERE competition_id = ? AND participant_type = 'player'",
+                       (comp['id'],))
+        num_players = cursor.fetchone()[0]
+        if num_players < 2:
+            conn.close()
+            return await ctx.send(f"⚠️ Not enough players in '{comp_name}' to generate swiss fixtures.")
+
+        pairs, bye_player = generate_swiss_round(cursor, comp['id'], 1)
+        embeds = swiss_round_embeds(comp_name, 1, pairs, bye_player)
+        embeds[0].description = f"{num_players} players, {swiss_round_count(num_players)} rounds. The next round is drawn when every match in this one is reported."
+
     conn.commit()
     conn.close()
 
-    await output_channel.send(embed=embed)
+    for embed in embeds:
+        await output_channel.send(embed=embed)
     await ctx.send(f"✅ Fixtures generated and saved. View them in {output_channel.mention}.")
 
 
+# --- ADMIN: BACKUPS ---
+
+@bot.command(name='backup', help='Takes a snapshot of the database without pausing the bot. Usage: !backup')
+@commands.has_role('Admin')
+async def backup(ctx):
+    await ctx.send("⏳ Backing up the database...")
+    try:
+        path = await run_in_thread(create_backup)
+    except (sqlite3.Error, OSError) as e:
+        return await ctx.send(f"⚠️ Backup failed: {e}")
+    await ctx.send(f"✅ Backup saved as `{os.path.basename(path)}`.")
+
+@bot.command(name='list_backups', help='Lists the available database snapshots. Usage: !list_backups')
+@commands.has_role('Admin')
+async def list_backups_cmd(ctx):
+    snapshots = backup_stats()
+    if not snapshots:
+        return await ctx.send("No backups have been taken yet.")
+
+    embed = discord.Embed(title="💾 Database Backups", color=discord.Color.dark_grey())
+    lines = []
+    for name, stat in snapshots[:25]:
+        size_kb = stat.st_size / 1024
+        lines.append(f"`{name}` ({size_kb:.0f} KB)")
+    embed.description = '\n'.join(lines)
+    await ctx.send(embed=embed)
+
+@bot.command(name='restore_backup', help='(Use with care!) Restores the database from a snapshot. Usage: !restore_backup "snapshot name"')
+@commands.has_role('Admin')
+async def restore_backup_cmd(ctx, snapshot_name: str):
+    if snapshot_name not in list_backups():
+        return await ctx.send(f"⚠️ Snapshot '{snapshot_name}' not found. Use `!list_backups` to see what is available.")
+
+    await ctx.send(f"⚠️ Restoring will replace **all** current data with `{snapshot_name}`. **Are you sure?** (yes/no)")
+
+    def check(m):
+        return m.author == ctx.author and m.channel == ctx.channel and m.content.lower() in ['yes', 'no']
+
+    try:
+        msg = await bot.wait_for('message', timeout=30.0, check=check)
+        if msg.content.lower() == 'no':
+            return await ctx.send("Restore cancelled.")
+    except asyncio.TimeoutError:
+        return await ctx.send("No response received. Aborting restore.")
+
+    try:
+        safety_path = await run_in_thread(restore_backup, snapshot_name)
+    except (sqlite3.Error, OSError) as e:
+        return await ctx.send(f"⚠️ Restore failed: {e}")
+    rebuild_name_indexes()
+    await ctx.send(f"✅ Database restored from `{snapshot_name}`. The previous data was saved as `{os.path.basename(safety_path)}`.")
+
+
 # --- PLAYER-FACING COMMANDS ---
 
 @bot.command(name='report', help='Report a match result. Usage: !report "Comp Name" winner @winner loser @loser')
@@ -526,12 +1068,13 @@ async def report(ctx, comp_name: str, winner_keyword: str, winner: discord.Membe
     if winner_keyword.lower() != 'winner' or loser_keyword.lower() != 'loser':
         return await ctx.send("⚠️ Invalid format. Use: `!report \"Comp Name\" winner @user loser @user`")
 
+    comp_name = resolve_name('competition', comp_name)
     conn = db_connect()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM competitions WHERE name = ?", (comp_name,))
     comp = cursor.fetchone()
     if not comp:
-        return await ctx.send(f"⚠️ Competition '{comp_name}' not found.")
+        return await ctx.send(f"⚠️ Competition '{comp_name}' not found.{did_you_mean('competition', comp_name)}")
     
     # --- Update Fixture Status ---
     # Find the corresponding fixture and mark it as complete.
@@ -544,6 +1087,13 @@ async def report(ctx, comp_name: str, winner_keyword: str, winner: discord.Membe
               ((participant1_id = ? AND participant2_id = ?) OR (participant1_id = ? AND participant2_id = ?))
     """
     cursor.execute(fixture_query, (comp['id'], winner.id, loser.id, loser.id, winner.id))
+    fixture_closed = cursor.rowcount > 0
+
+    # Swiss points are counted from match_history, so only results for an open fixture may be recorded.
+    # This stops a match reported twice (or one that was never drawn) from giving the winner extra points.
+    if comp['type'] == 'swiss' and not fixture_closed:
+        conn.close()
+        return await ctx.send(f"⚠️ There is no open fixture between {winner.display_name} and {loser.display_name} in '{comp_name}'. It may already have been reported.")
 
     # For team-based leagues, we might need a more complex lookup if we're only given players.
     # For now, this handles cup matches and any league matches reported between two specific players directly.
@@ -579,6 +1129,19 @@ async def report(ctx, comp_name: str, winner_keyword: str, winner: discord.Membe
     current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     cursor.execute("INSERT INTO match_history (competition_id, winner_id, loser_id, match_date) VALUES (?, ?, ?, ?)",
                    (comp['id'], winner.id, loser.id, current_date))
+
+    # --- Advance Swiss Rounds ---
+    # Once this result completes the current round, draw the next one (or finish the event).
+    next_round = None
+    final_standings = None
+    if comp['type'] == 'swiss' and fixture_closed:
+        current_round, open_fixtures, total_rounds = swiss_progress(cursor, comp['id'])
+        if open_fixtures == 0:
+            if current_round < total_rounds:
+                next_round = (current_round + 1, *generate_swiss_round(cursor, comp['id'], current_round + 1))
+            else:
+                final_standings = swiss_standings(cursor, comp['id'])
+
     conn.commit()
     conn.close()
 
@@ -594,6 +1157,14 @@ async def report(ctx, comp_name: str, winner_keyword: str, winner: discord.Membe
     if output_channel != ctx.channel:
         await ctx.send(f"✅ Result logged in {output_channel.mention}.", delete_after=10)
 
+    if next_round or final_standings:
+        fixtures_channel = bot.get_channel(comp['fixtures_channel_id']) if comp['fixtures_channel_id'] else ctx.channel
+        if next_round:
+            for round_embed in swiss_round_embeds(comp_name, *next_round):
+                await fixtures_channel.send(embed=round_embed)
+        else:
+            await fixtures_channel.send(embed=swiss_standings_embed(comp_name, final_standings))
+
 
 @bot.command(name='handicap', help='Check a player\'s handicap and streak. Usage: !handicap @user')
 async def handicap(ctx, member: discord.Member):
@@ -628,6 +1199,7 @@ async def next_game(ctx, comp_name: str, member: discord.Member = None):
     if member is None:
         member = ctx.author
 
+    comp_name = resolve_name('competition', comp_name)
     conn = db_connect()
     cursor = conn.cursor()
 
@@ -636,12 +1208,12 @@ async def next_game(ctx, comp_name: str, member: discord.Member = None):
     comp = cursor.fetchone()
     if not comp:
         conn.close()
-        return await ctx.send(f"⚠️ Competition '{comp_name}' not found.")
+        return await ctx.send(f"⚠️ Competition '{comp_name}' not found.{did_you_mean('competition', comp_name)}")
 
     next_fixture = None
     opponent_name = None
 
-    if comp['type'] == 'cup': # Individual player lookup
+    if comp['type'] in ('cup', 'swiss'): # Individual player lookup
         cursor.execute("""
             SELECT f.*, p1.name as p1_name, p2.name as p2_name
             FROM fixtures f
@@ -693,6 +1265,17 @@ async def next_game(ctx, comp_name: str, member: discord.Member = None):
     else:
         await ctx.send(f"✅ No upcoming games found for {member.display_name} in '{comp_name}'. All fixtures may be complete!")
 
+@bot.command(name='find', help='Searches teams, players and competitions by name. Usage: !find <text>')
+async def find(ctx, *, query: str):
+    embed = discord.Embed(title=f"🔎 Search Results for '{query}'", color=discord.Color.blue())
+    for kind, label in (('competition', '🏆 Competitions'), ('team', '👥 Teams'), ('player', '🎱 Players')):
+        matches = name_indexes[kind].search(query)
+        if matches:
+            embed.add_field(name=label, value='\n'.join(matches), inline=False)
+    if not embed.fields:
+        return await ctx.send(f"No competitions, teams or players match '{query}'.")
+    await ctx.send(embed=embed)
+
 
 # --- ERROR HANDLING ---
 @bot.event